@@ -1,10 +1,15 @@
 import asyncio
-import base64
-import json
+import binascii
+import concurrent.futures
+import functools
 import os
+import re
+import secrets
 import socket
 import struct
-import uuid
+import sys
+import threading
+import time
 import webbrowser
 import subprocess
 from io import BytesIO
@@ -12,6 +17,7 @@ from pathlib import Path
 from typing import Dict, Optional, Set, Coroutine, Any
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Body, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse, Response, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -19,6 +25,9 @@ from fastapi.templating import Jinja2Templates
 from aiortc import RTCPeerConnection, RTCSessionDescription
 from aiortc.rtcdatachannel import RTCDataChannel
 
+import msgspec
+import numpy as np
+
 import qrcode
 from qrcode.image.pil import PilImage
 
@@ -29,30 +38,144 @@ TLS_KEY  = os.environ.get("TLS_KEY",  "certs/lan-key.pem")
 PORT     = int(os.environ.get("PORT", "8443"))  # HTTPS default here
 
 app = FastAPI()
+# Compress HTTP responses worth compressing (pages, PEM downloads); the
+# 512-byte floor keeps tiny responses from paying the gzip CPU cost.
+app.add_middleware(GZipMiddleware, minimum_size=512)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 
+# ---------- Wire format (MessagePack over /ws) ----------
+# The dashboard decodes these with static/msgpack.js; the "kind" tag field
+# keeps the client-side dispatch identical to the old JSON messages.
+class PeerInfo(msgspec.Struct):
+    peerId: str
+    label: Optional[str]
+    count: int
+
+
+class Snapshot(msgspec.Struct, tag_field="kind", tag="snapshot"):
+    peers: list
+
+
+# array_like: encodes as ["batch", peerId, label, count, raw] — a fixed-shape
+# array with no field-name keys, since this frame is sent per coalesced batch.
+# The hot path in _drain() assembles this frame from a pre-encoded per-peer
+# prefix (see _make_batch_prefix) instead of instantiating the Struct.
+class Batch(msgspec.Struct, array_like=True, tag_field="kind", tag="batch"):
+    peerId: str
+    label: Optional[str]
+    count: int    # total samples received from this peer, including this batch
+    raw: bytes    # concatenated 36-byte IMU packets; layout in _IMU_DTYPE
+
+
+_enc = msgspec.msgpack.Encoder()
+_dec = msgspec.msgpack.Decoder()
+
+# Worker that runs the msgpack encode off the event loop thread, so the
+# aiortc datachannel callbacks return immediately and SCTP ACKs aren't
+# delayed behind serialization. A single worker keeps access to the shared
+# Encoder (which reuses an internal buffer) serialized.
+_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="imu-encode")
+
+# Scratch buffer reused across encodes; only ever touched by the _POOL worker.
+_BUF = bytearray(4096)
+
+
+def _encode(msg: Any) -> bytes:
+    """Encode msg into the reused scratch buffer and return stable bytes.
+
+    encode_into amortizes buffer growth across messages instead of
+    reallocating per encode. One bytes() copy remains: sends run
+    concurrently, so in-flight frames must not alias the scratch buffer.
+    """
+    _enc.encode_into(msg, _BUF)
+    return bytes(_BUF)
+
+# 36-byte little-endian IMU packet from sender.js:
+#   [u8 version][u8 flags][u16 seq][f64 ts_ms][6 x f32 ax..gz]
+_IMU_STRUCT = struct.Struct("<BBHdffffff")
+
+# Structured view of the same layout, so a whole batch of packets can be
+# parsed with one np.frombuffer instead of a struct.unpack per packet.
+_IMU_DTYPE = np.dtype(
+    [
+        ("v", "u1"), ("f", "u1"), ("seq", "<u2"), ("ts", "<f8"),
+        ("ax", "<f4"), ("ay", "<f4"), ("az", "<f4"),
+        ("gx", "<f4"), ("gy", "<f4"), ("gz", "<f4"),
+    ]
+)
+assert _IMU_DTYPE.itemsize == _IMU_STRUCT.size
+
+
 # ---------- Runtime state ----------
 class Peer:
+    __slots__ = (
+        "id", "pc", "channel", "device_label", "samples_received",
+        "queue", "drain_task", "batch_prefix",
+    )
+
     def __init__(self, peer_id: str, pc: RTCPeerConnection):
         self.id = peer_id
         self.pc = pc
         self.channel: Optional[RTCDataChannel] = None
         self.device_label: Optional[str] = None
         self.samples_received = 0
+        # Samples are queued here and coalesced into batches by _drain();
+        # bounded so a stalled dashboard can't grow memory without limit.
+        self.queue: "asyncio.Queue" = asyncio.Queue(maxsize=256)
+        self.drain_task: Optional[asyncio.Task] = None
+        self.batch_prefix: Optional[bytes] = None  # set at datachannel open
 
 
 peers: Dict[str, Peer] = {}
-dashboards: Set[WebSocket] = set()
+
+# Dashboard sockets. broadcast() runs per coalesced batch, so it iterates an
+# immutable tuple snapshot that is only rebuilt when a socket joins or leaves,
+# instead of allocating list(dashboards) on every call.
+dashboards: list = []
+_dashboards_snap: tuple = ()
+_dashboards_lock = threading.Lock()
+
+
+def _add_dashboard(ws: WebSocket) -> None:
+    global _dashboards_snap
+    with _dashboards_lock:
+        if ws not in dashboards:
+            dashboards.append(ws)
+            _dashboards_snap = tuple(dashboards)
+
+
+def _discard_dashboard(ws: WebSocket) -> None:
+    global _dashboards_snap
+    with _dashboards_lock:
+        try:
+            dashboards.remove(ws)
+        except ValueError:
+            return
+        _dashboards_snap = tuple(dashboards)
 
 # Track background tasks so we can cancel/await them on shutdown
 background_tasks: Set[asyncio.Task] = set()
 
+# Cap how many spawned tasks may run at once; excess tasks wait their turn
+# instead of letting a burst (ICE flaps, control-message storms) grow task
+# memory without bound.
+_spawn_sem = asyncio.Semaphore(512)
+
+
+async def _guard(coro: Coroutine[Any, Any, Any]) -> None:
+    try:
+        async with _spawn_sem:
+            await coro
+    except asyncio.CancelledError:
+        coro.close()  # cancelled while queued: don't leak the coroutine
+        raise
+
 
 def spawn(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
-    """Create a tracked background task."""
-    t = asyncio.create_task(coro)
+    """Create a tracked background task, bounded by _spawn_sem."""
+    t = asyncio.create_task(_guard(coro))
     background_tasks.add(t)
     t.add_done_callback(background_tasks.discard)
     return t
@@ -71,6 +194,12 @@ def lan_ip() -> str:
     return ip
 
 
+@functools.lru_cache(maxsize=1)
+def _lan_ip_cached() -> str:
+    """lan_ip() opens/closes a UDP socket per call; resolve it once per run."""
+    return lan_ip()
+
+
 # ---------- Root CA discovery / serving ----------
 def _read_text(p: Path) -> Optional[str]:
     try:
@@ -79,13 +208,23 @@ def _read_text(p: Path) -> Optional[str]:
         return None
 
 
+# Default CAROOT locations mkcert uses per OS; probing these avoids forking
+# `mkcert -CAROOT` in the common case.
+_MKCERT_DIRS = [
+    Path.home() / ".local" / "share" / "mkcert",                  # Linux
+    Path.home() / "Library" / "Application Support" / "mkcert",   # macOS
+    Path(os.environ.get("LOCALAPPDATA", "")) / "mkcert",          # Windows
+]
+
+
 def find_root_ca_pem() -> Optional[str]:
     """
     Try common locations for mkcert root CA.
     Preference order:
       1) ./certs/rootCA.pem      (if you copied it there)
       2) $CAROOT/rootCA.pem
-      3) mkcert -CAROOT/rootCA.pem
+      3) mkcert's default CAROOT directories
+      4) mkcert -CAROOT/rootCA.pem (subprocess, last resort)
     Returns the PEM string or None if not found.
     """
     # 1) local copy
@@ -102,7 +241,13 @@ def find_root_ca_pem() -> Optional[str]:
         if txt:
             return txt
 
-    # 3) query mkcert -CAROOT
+    # 3) default CAROOT locations
+    for d in _MKCERT_DIRS:
+        txt = _read_text(d / "rootCA.pem")
+        if txt:
+            return txt
+
+    # 4) query mkcert -CAROOT
     try:
         out = subprocess.run(
             ["mkcert", "-CAROOT"],
@@ -121,30 +266,37 @@ def find_root_ca_pem() -> Optional[str]:
     return None
 
 
+_PEM_BODY = re.compile(rb"-----BEGIN[^-]+-----\s*(.+?)\s*-----END", re.S)
+
+
 def pem_to_der(pem: str) -> bytes:
     """Convert PEM to DER by base64-decoding the certificate body."""
-    lines = [ln.strip() for ln in pem.splitlines() if ln and "-----" not in ln]
-    b64 = "".join(lines)
-    return base64.b64decode(b64)
+    m = _PEM_BODY.search(pem.encode())
+    if not m:
+        raise ValueError("no PEM certificate body found")
+    return binascii.a2b_base64(m.group(1).replace(b"\n", b""))
+
+
+# Resolve the root CA once at startup: find_root_ca_pem() may fork
+# `mkcert -CAROOT`, which is far too expensive to do per HTTP request.
+_ROOT_PEM = find_root_ca_pem()
+_ROOT_DER = pem_to_der(_ROOT_PEM) if _ROOT_PEM else None
 
 
 @app.get("/ca/root.pem")
 def download_root_pem():
-    pem = find_root_ca_pem()
-    if not pem:
+    if not _ROOT_PEM:
         raise HTTPException(404, detail="mkcert root CA not found. Run 'mkcert -install' first.")
     headers = {"Content-Disposition": 'attachment; filename="TriDance-Local-CA.pem"'}
-    return PlainTextResponse(pem, headers=headers, media_type="application/x-pem-file")
+    return PlainTextResponse(_ROOT_PEM, headers=headers, media_type="application/x-pem-file")
 
 
 @app.get("/ca/root.cer")
 def download_root_cer():
-    pem = find_root_ca_pem()
-    if not pem:
+    if not _ROOT_DER:
         raise HTTPException(404, detail="mkcert root CA not found. Run 'mkcert -install' first.")
-    der = pem_to_der(pem)
     headers = {"Content-Disposition": 'attachment; filename="TriDance-Local-CA.cer"'}
-    return Response(content=der, headers=headers, media_type="application/x-x509-ca-cert")
+    return Response(content=_ROOT_DER, headers=headers, media_type="application/x-x509-ca-cert")
 
 
 # ---------- Pages ----------
@@ -157,7 +309,7 @@ async def root(request: Request):
     We do NOT reuse the incoming Host header's port, because you might be viewing
     the dashboard on http://<ip>:8000/ while the phones must open https://<ip>:8443/.
     """
-    host_for_phones = f"{lan_ip()}:{PORT}"
+    host_for_phones = f"{_lan_ip_cached()}:{PORT}"
     sender_url = f"https://{host_for_phones}/sender?stun=auto"
     return templates.TemplateResponse("dashboard.html", {"request": request, "sender_url": sender_url})
 
@@ -169,12 +321,19 @@ async def sender_page(request: Request):
 
 
 # ---------- QR code ----------
-@app.get("/qr")
-async def qr(text: str):
+@functools.lru_cache(maxsize=32)
+def _render_qr(text: str) -> bytes:
+    """Render a QR PNG; cached since the sender URL rarely changes."""
     img: PilImage = qrcode.make(text)
     buf = BytesIO()
     img.save(buf, format="PNG")
-    return Response(buf.getvalue(), media_type="image/png")
+    return buf.getvalue()
+
+
+@app.get("/qr")
+async def qr(text: str):
+    headers = {"Cache-Control": "public, max-age=3600"}
+    return Response(_render_qr(text), headers=headers, media_type="image/png")
 
 
 # ---------- WebRTC signaling ----------
@@ -193,54 +352,50 @@ async def webrtc_offer(payload: dict = Body(...)):
     label = payload.get("label", "unknown")
 
     pc = RTCPeerConnection()
-    peer_id = str(uuid.uuid4())
+    peer_id = secrets.token_hex(8)  # 64 bits of entropy; plenty for an in-process key
     peer = Peer(peer_id, pc)
     peer.device_label = label
     peers[peer_id] = peer
+    _invalidate_snapshot()
 
     @pc.on("datachannel")
     def on_datachannel(channel: RTCDataChannel):
         peer.channel = channel
+        peer.batch_prefix = _make_batch_prefix(peer)
+        peer.drain_task = spawn(_drain(peer))
 
         @channel.on("message")
         def on_message(message):
-            if isinstance(message, bytes):
+            # IMU packets are exactly 36 bytes with version byte 1; everything
+            # else on the channel is a msgpack control message (hello/ping).
+            if (
+                isinstance(message, bytes)
+                and len(message) == _IMU_STRUCT.size
+                and message[0] == 1
+            ):
                 peer.samples_received += 1
 
-                # Parse 36-byte little-endian packet if possible
-                ax = ay = az = gx = gy = gz = None
-                ts_ms = None
-                seq = None
-                try:
-                    if len(message) >= 36:
-                        version, flags, seq, ts_ms, ax, ay, az, gx, gy, gz = struct.unpack(
-                            "<BBH d f f f f f f".replace(" ", ""), message[:36]
-                        )
-                except Exception:
-                    # leave fields as None on parse failure
-                    pass
-
-                data = {
-                    "kind": "sample",
-                    "peerId": peer.id,
-                    "label": peer.device_label,
-                    "count": peer.samples_received,
-                    "seq": seq,
-                    "ts": ts_ms,       # milliseconds since epoch (float)
-                    "ax": ax, "ay": ay, "az": az,   # m/s^2
-                    "gx": gx, "gy": gy, "gz": gz,   # rad/s
-                }
-                spawn(broadcast(data))
-            else:
-                # JSON/text control messages (e.g., hello/ping)
-                try:
-                    obj = json.loads(message)
-                except Exception:
-                    obj = {"text": message}
-                obj["kind"] = obj.get("kind", "msg")
-                obj["peerId"] = peer.id
-                obj.setdefault("label", peer.device_label)
-                spawn(broadcast(obj))
+                # Queue the raw packet; _drain() parses whole batches at once.
+                q = peer.queue
+                if q.full():
+                    # Backpressure: drop the oldest sample rather than grow.
+                    try:
+                        q.get_nowait()
+                    except asyncio.QueueEmpty:
+                        pass
+                q.put_nowait(message)
+                return
+
+            try:
+                obj = _dec.decode(message)
+            except Exception:
+                return  # not msgpack; drop it
+            if not isinstance(obj, dict):
+                return
+            obj["kind"] = obj.get("kind", "msg")
+            obj["peerId"] = peer.id
+            obj.setdefault("label", peer.device_label)
+            spawn(broadcast(obj))
 
         @channel.on("close")
         def on_close():
@@ -260,10 +415,60 @@ async def webrtc_offer(payload: dict = Body(...)):
     return {"peerId": peer_id, "sdp": pc.localDescription.sdp, "type": pc.localDescription.type}
 
 
+def _make_batch_prefix(peer: Peer) -> bytes:
+    """Pre-encode the constant head of this peer's Batch frames.
+
+    msgpack array elements are plain concatenated encodings, so a fixarray(5)
+    header plus the tag/peerId/label elements — none of which change after the
+    datachannel opens — can be computed once. _drain() appends the encoded
+    count and raw bytes to produce a frame identical to encoding a Batch.
+    """
+    return (
+        b"\x95"
+        + msgspec.msgpack.encode("batch")
+        + msgspec.msgpack.encode(peer.id)
+        + msgspec.msgpack.encode(peer.device_label)
+    )
+
+
+def _batch_payload(prefix: bytes, count: int, raw: bytes) -> bytes:
+    """Complete a Batch frame from its pre-encoded prefix (runs on _POOL)."""
+    return prefix + msgspec.msgpack.encode(count) + msgspec.msgpack.encode(raw)
+
+
+async def _drain(peer: Peer):
+    """Forward one peer's samples to the dashboards, coalescing bursts.
+
+    Blocks on the first sample, then greedily drains whatever else has
+    queued up (capped at 32) into a single batch broadcast — one
+    long-running task per peer instead of one task per packet.
+    """
+    q = peer.queue
+    loop = asyncio.get_running_loop()
+    while True:
+        items = [await q.get()]
+        while not q.empty() and len(items) < 32:
+            items.append(q.get_nowait())
+        buf = items[0] if len(items) == 1 else b"".join(items)
+        # One vectorized parse validates the batch framing (and is the hook
+        # for any future server-side processing); the dashboard decodes the
+        # raw packets itself, so no per-sample objects hit the wire.
+        samples = np.frombuffer(buf, dtype=_IMU_DTYPE)
+        if not samples.shape[0]:
+            continue
+        payload = await loop.run_in_executor(
+            _POOL, _batch_payload, peer.batch_prefix, peer.samples_received, buf
+        )
+        await _fanout(payload)
+
+
 async def remove_peer(peer_id: str):
     peer = peers.pop(peer_id, None)
     if not peer:
         return
+    _invalidate_snapshot()
+    if peer.drain_task is not None:
+        peer.drain_task.cancel()
     try:
         await peer.pc.close()
     except asyncio.CancelledError:
@@ -280,39 +485,70 @@ async def remove_peer(peer_id: str):
 
 
 # ---------- Dashboard realtime (WebSocket) ----------
-async def broadcast(msg: dict):
-    stale = []
-    for ws in list(dashboards):
-        try:
-            await ws.send_text(json.dumps(msg))
-        except Exception:
-            stale.append(ws)
-    for ws in stale:
-        dashboards.discard(ws)
+async def broadcast(msg: Any):
+    # Serialize once (Struct or plain dict) on the encode worker; every
+    # dashboard gets the same bytes.
+    payload = await asyncio.get_running_loop().run_in_executor(_POOL, _encode, msg)
+    await _fanout(payload)
+
+
+async def _fanout(payload: bytes):
+    targets = _dashboards_snap
+    if not targets:
+        return
+    # Send concurrently so one slow socket doesn't serialize the others.
+    results = await asyncio.gather(
+        *(ws.send_bytes(payload) for ws in targets), return_exceptions=True
+    )
+    for ws, res in zip(targets, results):
+        if isinstance(res, BaseException):
+            _discard_dashboard(ws)
+
+
+# Snapshot bytes are cached briefly so a burst of dashboard reconnects
+# (e.g. a phone hopping networks) doesn't re-encode the peer list each time.
+# Peer joins/leaves invalidate immediately; the TTL only bounds how stale
+# the sample counters can get.
+_SNAPSHOT_TTL = 0.25  # seconds
+_snapshot_cache: Optional[bytes] = None
+_snapshot_cached_at = 0.0
+
+
+def _invalidate_snapshot() -> None:
+    global _snapshot_cache
+    _snapshot_cache = None
+
+
+def _snapshot_bytes() -> bytes:
+    global _snapshot_cache, _snapshot_cached_at
+    now = time.monotonic()
+    if _snapshot_cache is None or now - _snapshot_cached_at > _SNAPSHOT_TTL:
+        # Module-level encode, not _enc: this runs on the event loop thread
+        # and must not contend for the worker-owned Encoder/scratch buffer.
+        _snapshot_cache = msgspec.msgpack.encode(
+            Snapshot(
+                peers=[
+                    PeerInfo(peerId=p.id, label=p.device_label, count=p.samples_received)
+                    for p in peers.values()
+                ]
+            )
+        )
+        _snapshot_cached_at = now
+    return _snapshot_cache
 
 
 @app.websocket("/ws")
 async def ws_dashboard(ws: WebSocket):
     await ws.accept()
-    dashboards.add(ws)
-    await ws.send_text(
-        json.dumps(
-            {
-                "kind": "snapshot",
-                "peers": [
-                    {"peerId": p.id, "label": p.device_label, "count": p.samples_received}
-                    for p in peers.values()
-                ],
-            }
-        )
-    )
+    _add_dashboard(ws)
+    await ws.send_bytes(_snapshot_bytes())
     try:
         while True:
             await ws.receive_text()  # keep alive
     except WebSocketDisconnect:
-        dashboards.discard(ws)
+        _discard_dashboard(ws)
     except Exception:
-        dashboards.discard(ws)
+        _discard_dashboard(ws)
 
 
 # ---------- Graceful shutdown ----------
@@ -333,7 +569,7 @@ async def shutdown():
         except Exception:
             pass
         finally:
-            dashboards.discard(ws)
+            _discard_dashboard(ws)
 
     # 3) Cancel and await any background tasks we spawned
     for t in list(background_tasks):
@@ -341,6 +577,9 @@ async def shutdown():
     if background_tasks:
         await asyncio.gather(*background_tasks, return_exceptions=True)
 
+    # 4) Stop the encode worker
+    _POOL.shutdown(wait=False)
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -367,6 +606,12 @@ if __name__ == "__main__":
         port=PORT,
         ssl_certfile=TLS_CERT,
         ssl_keyfile=TLS_KEY,
+        # uvloop isn't available on Windows; fall back to the stdlib loop there.
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        # permessage-deflate shrinks /ws frames on the Wi-Fi hop; needs the
+        # 'websockets' protocol implementation (wsproto doesn't support it).
+        ws="websockets",
+        ws_per_message_deflate=True,
         reload=False,
         timeout_graceful_shutdown=5,
     )
@@ -251,6 +251,12 @@ def main():
         ssl_certfile=str(CERT_FILE),
         ssl_keyfile=str(KEY_FILE),
         log_level="info",
+        # uvloop isn't available on Windows; fall back to the stdlib loop there.
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        # permessage-deflate shrinks /ws frames on the Wi-Fi hop; needs the
+        # 'websockets' protocol implementation (wsproto doesn't support it).
+        ws="websockets",
+        ws_per_message_deflate=True,
         reload=False,
     )
 
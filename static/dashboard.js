@@ -78,11 +78,62 @@
     }
   }
 
+  function applySample(m) {
+    const p = byId.get(m.peerId) || {
+      peerId: m.peerId, label: m.label || "", count: 0,
+      ax: null, ay: null, az: null, gx: null, gy: null, gz: null,
+    };
+    p.count = m.count ?? p.count ?? 0;
+
+    if ("ax" in m) p.ax = m.ax;
+    if ("ay" in m) p.ay = m.ay;
+    if ("az" in m) p.az = m.az;
+    if ("gx" in m) p.gx = m.gx;
+    if ("gy" in m) p.gy = m.gy;
+    if ("gz" in m) p.gz = m.gz;
+
+    p.label = m.label || p.label;
+    byId.set(m.peerId, p);
+  }
+
+  function applyBatch(peerId, label, count, raw) {
+    // raw holds concatenated 36-byte IMU packets:
+    // [u8 ver][u8 flags][u16 seq][f64 ts_ms][6 x f32 ax..gz], little-endian.
+    const dv = new DataView(raw.buffer, raw.byteOffset, raw.byteLength);
+    const n = Math.floor(raw.byteLength / 36);
+    const base = (count ?? n) - n;
+    for (let i = 0; i < n; i++) {
+      const o = i * 36;
+      applySample({
+        peerId,
+        label,
+        count: base + i + 1,
+        seq: dv.getUint16(o + 2, true),
+        ts: dv.getFloat64(o + 4, true),
+        ax: dv.getFloat32(o + 12, true),
+        ay: dv.getFloat32(o + 16, true),
+        az: dv.getFloat32(o + 20, true),
+        gx: dv.getFloat32(o + 24, true),
+        gy: dv.getFloat32(o + 28, true),
+        gz: dv.getFloat32(o + 32, true),
+      });
+    }
+    updateAllRows();
+  }
+
   const proto = location.protocol === "https:" ? "wss" : "ws";
   const ws = new WebSocket(`${proto}://${location.host}/ws`);
+  ws.binaryType = "arraybuffer"; // server sends MessagePack binary frames
 
   ws.onmessage = (e) => {
-    const m = JSON.parse(e.data);
+    const m = msgpack.decode(new Uint8Array(e.data));
+
+    // Hot-path frames are fixed-shape tagged arrays (msgspec array_like):
+    //   ["batch", peerId, label, count, raw]
+    if (Array.isArray(m)) {
+      if (m[0] === "batch") applyBatch(m[1], m[2], m[3], m[4]);
+      return;
+    }
 
     if (m.kind === "snapshot") {
       for (const p of m.peers || []) {
@@ -104,27 +155,6 @@
       return;
     }
 
-    if (m.kind === "sample") {
-      const p = byId.get(m.peerId) || {
-        peerId: m.peerId, label: m.label || "", count: 0,
-        ax: null, ay: null, az: null, gx: null, gy: null, gz: null,
-      };
-      p.count = m.count ?? p.count ?? 0;
-
-      if ("ax" in m) p.ax = m.ax;
-      if ("ay" in m) p.ay = m.ay;
-      if ("az" in m) p.az = m.az;
-      if ("gx" in m) p.gx = m.gx;
-      if ("gy" in m) p.gy = m.gy;
-      if ("gz" in m) p.gz = m.gz;
-
-      p.label = m.label || p.label;
-      byId.set(m.peerId, p);
-
-      updateAllRows();
-      return;
-    }
-
     if (m.kind === "hello" || m.kind === "msg") {
       const p = byId.get(m.peerId) || {
         peerId: m.peerId, label: "", count: 0,
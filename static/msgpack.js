@@ -0,0 +1,184 @@
+// static/msgpack.js
+// Minimal MessagePack codec for the dashboard/sender pages.
+// Supports the subset the server uses: nil, bool, int, float, str, bin,
+// array, map. No ext types, no streaming.
+(function () {
+  const utf8enc = new TextEncoder();
+  const utf8dec = new TextDecoder();
+
+  // ---------- decode ----------
+  function Reader(buf) {
+    this.view = buf instanceof DataView ? buf : new DataView(buf.buffer || buf, buf.byteOffset || 0, buf.byteLength);
+    this.bytes = buf instanceof Uint8Array ? buf : new Uint8Array(this.view.buffer, this.view.byteOffset, this.view.byteLength);
+    this.pos = 0;
+  }
+
+  Reader.prototype.u8 = function () { return this.view.getUint8(this.pos++); };
+  Reader.prototype.u16 = function () { const v = this.view.getUint16(this.pos); this.pos += 2; return v; };
+  Reader.prototype.u32 = function () { const v = this.view.getUint32(this.pos); this.pos += 4; return v; };
+
+  Reader.prototype.str = function (len) {
+    const s = utf8dec.decode(this.bytes.subarray(this.pos, this.pos + len));
+    this.pos += len;
+    return s;
+  };
+
+  Reader.prototype.bin = function (len) {
+    const b = this.bytes.subarray(this.pos, this.pos + len);
+    this.pos += len;
+    return b;
+  };
+
+  Reader.prototype.array = function (n) {
+    const out = new Array(n);
+    for (let i = 0; i < n; i++) out[i] = this.any();
+    return out;
+  };
+
+  Reader.prototype.map = function (n) {
+    const out = {};
+    for (let i = 0; i < n; i++) {
+      const k = this.any();
+      out[k] = this.any();
+    }
+    return out;
+  };
+
+  Reader.prototype.any = function () {
+    const b = this.u8();
+    if (b < 0x80) return b;                       // positive fixint
+    if (b >= 0xe0) return b - 0x100;              // negative fixint
+    if (b >= 0xa0 && b <= 0xbf) return this.str(b & 0x1f);   // fixstr
+    if (b >= 0x90 && b <= 0x9f) return this.array(b & 0x0f); // fixarray
+    if (b >= 0x80 && b <= 0x8f) return this.map(b & 0x0f);   // fixmap
+    switch (b) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xc4: return this.bin(this.u8());
+      case 0xc5: return this.bin(this.u16());
+      case 0xc6: return this.bin(this.u32());
+      case 0xca: { const v = this.view.getFloat32(this.pos); this.pos += 4; return v; }
+      case 0xcb: { const v = this.view.getFloat64(this.pos); this.pos += 8; return v; }
+      case 0xcc: return this.u8();
+      case 0xcd: return this.u16();
+      case 0xce: return this.u32();
+      case 0xcf: { const v = Number(this.view.getBigUint64(this.pos)); this.pos += 8; return v; }
+      case 0xd0: { const v = this.view.getInt8(this.pos); this.pos += 1; return v; }
+      case 0xd1: { const v = this.view.getInt16(this.pos); this.pos += 2; return v; }
+      case 0xd2: { const v = this.view.getInt32(this.pos); this.pos += 4; return v; }
+      case 0xd3: { const v = Number(this.view.getBigInt64(this.pos)); this.pos += 8; return v; }
+      case 0xd9: return this.str(this.u8());
+      case 0xda: return this.str(this.u16());
+      case 0xdb: return this.str(this.u32());
+      case 0xdc: return this.array(this.u16());
+      case 0xdd: return this.array(this.u32());
+      case 0xde: return this.map(this.u16());
+      case 0xdf: return this.map(this.u32());
+      default:
+        throw new Error("msgpack: unsupported type byte 0x" + b.toString(16));
+    }
+  };
+
+  function decode(data) {
+    return new Reader(data).any();
+  }
+
+  // ---------- encode ----------
+  function Writer() {
+    this.chunks = [];
+    this.length = 0;
+  }
+
+  Writer.prototype.push = function (bytes) {
+    this.chunks.push(bytes);
+    this.length += bytes.length;
+  };
+
+  Writer.prototype.header = function (b, len, bytes) {
+    const h = new Uint8Array(1 + bytes);
+    const dv = new DataView(h.buffer);
+    dv.setUint8(0, b);
+    if (bytes === 1) dv.setUint8(1, len);
+    else if (bytes === 2) dv.setUint16(1, len);
+    else if (bytes === 4) dv.setUint32(1, len);
+    this.push(h);
+  };
+
+  Writer.prototype.any = function (v) {
+    if (v === null || v === undefined) return this.push(Uint8Array.of(0xc0));
+    if (v === false) return this.push(Uint8Array.of(0xc2));
+    if (v === true) return this.push(Uint8Array.of(0xc3));
+
+    if (typeof v === "number") {
+      if (Number.isInteger(v) && v >= -0x80000000 && v <= 0xffffffff) {
+        if (v >= 0 && v < 0x80) return this.push(Uint8Array.of(v));
+        if (v < 0 && v >= -32) return this.push(Uint8Array.of(v & 0xff));
+        if (v >= 0) {
+          if (v <= 0xff) return this.header(0xcc, v, 1);
+          if (v <= 0xffff) return this.header(0xcd, v, 2);
+          return this.header(0xce, v, 4);
+        }
+        const b = new Uint8Array(5);
+        const dv = new DataView(b.buffer);
+        if (v >= -0x80) { dv.setUint8(0, 0xd0); dv.setInt8(1, v); return this.push(b.subarray(0, 2)); }
+        if (v >= -0x8000) { dv.setUint8(0, 0xd1); dv.setInt16(1, v); return this.push(b.subarray(0, 3)); }
+        dv.setUint8(0, 0xd2); dv.setInt32(1, v); return this.push(b);
+      }
+      const b = new Uint8Array(9);
+      const dv = new DataView(b.buffer);
+      dv.setUint8(0, 0xcb);
+      dv.setFloat64(1, v);
+      return this.push(b);
+    }
+
+    if (typeof v === "string") {
+      const bytes = utf8enc.encode(v);
+      if (bytes.length < 32) this.push(Uint8Array.of(0xa0 | bytes.length));
+      else if (bytes.length <= 0xff) this.header(0xd9, bytes.length, 1);
+      else if (bytes.length <= 0xffff) this.header(0xda, bytes.length, 2);
+      else this.header(0xdb, bytes.length, 4);
+      return this.push(bytes);
+    }
+
+    if (v instanceof ArrayBuffer) v = new Uint8Array(v);
+    if (v instanceof Uint8Array) {
+      if (v.length <= 0xff) this.header(0xc4, v.length, 1);
+      else if (v.length <= 0xffff) this.header(0xc5, v.length, 2);
+      else this.header(0xc6, v.length, 4);
+      return this.push(v);
+    }
+
+    if (Array.isArray(v)) {
+      if (v.length < 16) this.push(Uint8Array.of(0x90 | v.length));
+      else if (v.length <= 0xffff) this.header(0xdc, v.length, 2);
+      else this.header(0xdd, v.length, 4);
+      for (const item of v) this.any(item);
+      return;
+    }
+
+    // plain object -> map
+    const keys = Object.keys(v);
+    if (keys.length < 16) this.push(Uint8Array.of(0x80 | keys.length));
+    else if (keys.length <= 0xffff) this.header(0xde, keys.length, 2);
+    else this.header(0xdf, keys.length, 4);
+    for (const k of keys) {
+      this.any(k);
+      this.any(v[k]);
+    }
+  };
+
+  function encode(v) {
+    const w = new Writer();
+    w.any(v);
+    const out = new Uint8Array(w.length);
+    let o = 0;
+    for (const c of w.chunks) {
+      out.set(c, o);
+      o += c.length;
+    }
+    return out;
+  }
+
+  window.msgpack = { decode, encode };
+})();
@@ -109,7 +109,7 @@
 
     dc.onopen = () => {
       if (statusEl) { statusEl.textContent = "Connected ✅"; statusEl.className = "ok"; }
-      dc.send(JSON.stringify({ kind: "hello", label }));
+      dc.send(msgpack.encode({ kind: "hello", label }));
       log("DataChannel open");
     };
 
@@ -188,7 +188,7 @@
 
     setInterval(() => {
       if (dc.readyState === "open") {
-        dc.send(JSON.stringify({ kind: "ping", t: Date.now() }));
+        dc.send(msgpack.encode({ kind: "ping", t: Date.now() }));
       }
     }, 5000);
   }